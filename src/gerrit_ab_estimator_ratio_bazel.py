@@ -9,9 +9,18 @@
 #      · gerrit_sample_corrected_YYYYMMDD.json
 # ──────────────────────────────────────────────────────────────
 import re, json, os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from urllib.parse import quote
+import pandas as pd
 from pygerrit2 import GerritRestAPI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import orjson                    # optional – faster JSON encoder
+except ImportError:
+    orjson = None
 
 # -------------- CONFIG --------------------------------------------------
 HOSTS = {
@@ -27,6 +36,8 @@ HOSTS = {
 }
 SINCE = "2023-01-01"
 OPT   = "o=CURRENT_REVISION&o=MESSAGES"
+MAX_WORKERS = 8      # concurrent project fetches (keep Gerrit load modest)
+SAMPLE_N    = 50     # changes kept for each JSON sample
 
 OUTDIR = "data"
 os.makedirs(OUTDIR, exist_ok=True)
@@ -37,38 +48,74 @@ corr_path = os.path.join(OUTDIR, f"gerrit_sample_corrected_{today}.json")
 
 # -------------- DEFECT-DETECTION HEURISTIC ------------------------------
 PAT = re.compile(r"\b(nit|fix|typo|minor)\b", re.I)
+
+@lru_cache(maxsize=4096)   # vote/bot messages repeat verbatim across changes
 def chk(text:str)->bool:
-    return ("Code-Review" in text and ("-1" in text or "-2" in text)) or \
-           ("Verified"    in text and "-1" in text) or bool(PAT.search(text))
+    # same rule as before, but each substring is scanned at most once and we
+    # return on the first hit:  (CR ∧ (-1 ∨ -2)) ∨ (Verified ∧ -1) ∨ PAT
+    if "-1" in text and ("Code-Review" in text or "Verified" in text):
+        return True
+    if "-2" in text and "Code-Review" in text:
+        return True
+    return PAT.search(text) is not None
 
-def worker_ok(c)  -> bool: return not any(chk(m["message"]) for m in c["messages"])
+# a change is "worker OK" exactly when no defect was hit, so one scan per
+# change gives both a_hat (= 1 - b_dir) and b_dir
 def defect_hit(c) -> bool: return any(chk(m["message"]) for m in c["messages"])
 
 # -------------- API FETCH -----------------------------------------------
 def fetch_changes(rest: GerritRestAPI, project:str):
+    """Yield merged changes page by page (nothing is accumulated)."""
     pq = quote(f"project:{project}", safe=":")
-    out, more, s = [], True, 0
+    base_q = f"/changes/?q={pq}+status:merged+after:{SINCE}&n=100&{OPT}&S="
+    more, s = True, 0
     while more:
-        q = f"/changes/?q={pq}+status:merged+after:{SINCE}&n=100&{OPT}&S={s}"
-        chunk = rest.get(q)
+        chunk = rest.get(base_q + str(s))
         if not chunk: break
-        out.extend(chunk)
+        yield from chunk
         more = chunk[-1].get("_more_changes", False)
         s   += 100
-    return out
+
+def make_adapter() -> HTTPAdapter:
+    """Keep-alive pool sized for MAX_WORKERS; retries rate limits and 5xx."""
+    retry = Retry(total=5, backoff_factor=0.3,
+                  status_forcelist=(429, 500, 502, 503, 504))
+    return HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS,
+                       max_retries=retry)
 
 # -------------- AGGREGATION ---------------------------------------------
-rows, all_changes = [], []
-for host, projects in HOSTS.items():
-    rest = GerritRestAPI(url=host)
-    for prj in projects:
-        ch = fetch_changes(rest, prj)
-        N  = len(ch)
-        if N == 0: continue
-        a_hat = sum(worker_ok(c)  for c in ch) / N
-        b_dir = sum(defect_hit(c) for c in ch) / N
-        rows.append((prj, N, a_hat, b_dir))
-        all_changes.extend(ch)
+def scan_project(rest: GerritRestAPI, project:str):
+    """Stream one project; return N, #defect hits and the JSON sample rows."""
+    n = n_hit = 0
+    sample_all, sample_corr = [], []
+    for c in fetch_changes(rest, project):
+        hit = defect_hit(c)
+        n     += 1
+        n_hit += hit
+        if len(sample_all) < SAMPLE_N:
+            sample_all.append(c)
+        if hit and len(sample_corr) < SAMPLE_N:
+            sample_corr.append(c)
+    return n, n_hit, sample_all, sample_corr
+
+# one client (= one HTTP session) per host; projects are fetched concurrently
+# because wall time is dominated by round-trip latency, not by parsing
+rests = {host: GerritRestAPI(url=host, adapter=make_adapter()) for host in HOSTS}
+jobs  = [(rests[host], prj) for host, projects in HOSTS.items() for prj in projects]
+with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(jobs))) as ex:
+    scanned = list(ex.map(lambda job: scan_project(*job), jobs))
+
+rows, sample_all, sample_corr = [], [], []
+Ntot = n_hit_tot = 0
+for (_, prj), (N, n_hit, s_all, s_corr) in zip(jobs, scanned):
+    if N == 0: continue
+    a_hat = (N - n_hit) / N
+    b_dir = n_hit / N
+    rows.append((prj, N, a_hat, b_dir))
+    Ntot      += N
+    n_hit_tot += n_hit
+    sample_all.extend(s_all)
+    sample_corr.extend(s_corr)
 
 # legacy = exclude bazel + okhttp
 legacy_rows = [r for r in rows if r[0] not in {"bazel","platform/external/okhttp"}]
@@ -77,17 +124,19 @@ a_leg = sum(r[2]*r[1] for r in legacy_rows)/N_leg
 b_leg = sum(r[3]*r[1] for r in legacy_rows)/N_leg
 
 # -------------- CONSOLE & TXT OUTPUT ------------------------------------
-header = f"{'Project':25s} {'N':>6s}   {'a_hat':>6s}   {'b_dir':>6s}"
-lines  = [header]
-for p,n,a,b in sorted(rows, key=lambda x: x[0]):
-    lines.append(f"{p:25s} {n:6d}   {a:6.3f}   {b:6.3f}")
+a_tot = (Ntot - n_hit_tot)/Ntot
+b_tot = n_hit_tot/Ntot
 
-Ntot  = len(all_changes)
-a_tot = sum(worker_ok(c)  for c in all_changes)/Ntot
-b_tot = sum(defect_hit(c) for c in all_changes)/Ntot
-lines.append(f"\nWeighted avg (all)        {Ntot:6d}   {a_tot:.3f}   {b_tot:.3f}")
-lines.append(f"Weighted avg (legacy)     {N_leg:6d}   {a_leg:.3f}   {b_leg:.3f}")
+cols  = ["Project", "N", "a_hat", "b_dir"]
+table = pd.concat([
+    pd.DataFrame(rows, columns=cols).sort_values("Project"),
+    pd.DataFrame([("Weighted avg (all)",    Ntot,  a_tot, b_tot),
+                  ("Weighted avg (legacy)", N_leg, a_leg, b_leg)], columns=cols),
+]).set_index("Project").rename_axis(None)
 
+lines = table.to_string(float_format="%.3f", col_space=8).split("\n")
+lines[0] = "Project" + lines[0][len("Project"):]   # label the index column
+lines.insert(len(rows) + 1, "")                    # blank line before averages
 out_txt = "\n".join(lines)
 print(out_txt)
 
@@ -96,14 +145,19 @@ with open(txt_path, "w") as f:
 print(f">> Saved text table to {txt_path}")
 
 # -------------- JSON SAMPLES --------------------------------------------
+def dump_json(obj, path:str):
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
+
 # (i) first 50 merged changes as-is
-with open(all_path, "w") as f:
-    json.dump(all_changes[:50], f, indent=2)
+dump_json(sample_all[:SAMPLE_N], all_path)
 
 # (ii) first 50 “defect-detected” (= cross-checked) changes
-corrected = [c for c in all_changes if defect_hit(c)]
-with open(corr_path, "w") as f:
-    json.dump(corrected[:50], f, indent=2)
+dump_json(sample_corr[:SAMPLE_N], corr_path)
 
 print(f">> Saved 50-row ALL sample       to {all_path}")
 print(f">> Saved 50-row CORRECTED sample to {corr_path}")
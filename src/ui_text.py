@@ -0,0 +1,353 @@
+# ──────────────────────────────────────────────────────────────
+#  Cross‑Check Framework  •  UI language packs (EN / JA / CAT)
+# ──────────────────────────────────────────────────────────────
+#  Kept out of streamlit_app.py on purpose: Streamlit re‑executes the
+#  app script on every interaction, whereas an imported module is built
+#  once per process and then served from sys.modules.
+# ----------------------------------------------------------------
+
+# --- Localisation dictionaries (English & Japanese) -------------
+# *Monte Carlo / Sobol 説明文を UI 基準 ±α% 仕様に書き換え*
+# ░░░  Language packs with super-detailed, publication-ready wording  ░░░
+#  *Key structure is 100 % backward-compatible with the original code.*
+
+TXT_EN = {
+    "panel": {
+        "input": "INPUT PANEL",
+        "output": "KEY OUTPUT METRICS",
+    },
+    "metrics": {
+        "a_total": "a_total",
+        "succ": "Success Rate S",
+        "C": "Labor Cost C",
+        "Closs": "C_total (incl. loss)",
+        "loss_unit": "Loss unit ℓ",
+        "E_base": "Efficiency E (baseline)",
+        "E_total": "E_total",
+    },
+    "charts": {
+        # ———————————————————————————————————————————————
+        "quality_schedule": {
+            "title": "Quality × Schedule 2 × 2 Matrix",
+            "expander_title": "📘 About the Quality × Schedule Chart",
+            "expander_content": (
+                "This 2 × 2 bar chart conveys the combined impact of the **quality policy** "
+                "(e.g., ‘Standard’ vs ‘Low’) and the **schedule policy** "
+                "(‘On-time’ vs ‘Late’) on the total cost-per-success **E_total**.  \n\n"
+                "- **Bar height = E_total**  (the lower, the better).  \n"
+                "- **Bar label = success probability S**  (shown as a percentage).  \n\n"
+                "Reading tip  →  Compare the four cells horizontally and vertically to "
+                "discern whether quality or schedule exerts a stronger economic leverage "
+                "under the current parameter baseline."
+            ),
+        },
+        # ———————————————————————————————————————————————
+        "tornado": {
+            "title": "Local Tornado Sensitivity (±20 %)",
+            "expander_title": "📘 Interpreting the Tornado Diagram",
+            "expander_content": (
+                "The tornado diagram quantifies the **local (one-at-a-time) sensitivity** of "
+                "E_total to each input parameter by perturbing that parameter ±20 % around "
+                "its current UI value *while holding all others fixed*.  \n\n"
+                "- **Bar length |ΔE/E|**  = relative change in E_total.  \n"
+                "- **Ordering**  = bars are sorted from the most to the least influential, "
+                "making the plot visually resemble a tornado.  \n\n"
+                "Use this view to prioritise which parameter warrants the most immediate "
+                "attention when performing local optimisation or design-of-experiments."
+            ),
+            "xaxis": "|ΔE/E|",
+        },
+        # ———————————————————————————————————————————————
+        "sobol": {
+            "title": "Global Sensitivity (Sobol S₁)",
+            "expander_title": "📘 Sobol Global Sensitivity Analysis",
+            "expander_content": (
+                "We perform a variance-based global sensitivity analysis employing the "
+                "Saltelli extension of Sobol’ sampling.  \n\n"
+                "- **Sampling bounds**  = each parameter is allowed to vary within ±α % of "
+                "its UI baseline (α depends on the parameter class; see code comments).  \n"
+                "- **Displayed metric**  = first-order Sobol index **S₁**, which represents "
+                "the fraction of total output variance attributable to that parameter alone, "
+                "excluding interaction effects.  \n\n"
+                "A larger S₁ indicates a stronger contribution to the uncertainty of "
+                "E_total across the multidimensional parameter space."
+            ),
+            "xaxis": "Sobol S₁",
+        },
+        # ———————————————————————————————————————————————
+        "relative_sensitivity": {
+            "title": "Relative Elasticity",
+            "xaxis": "Relative Sensitivity  (∂E/∂x · x / E)",
+            "expander_title": "📘 Relative vs Standardised Sensitivity",
+            "expander_content": (
+                "**Relative (elasticity)** expresses how many percent E_total changes in "
+                "response to a 1 % proportional change in a given parameter (i.e., a "
+                "dimension-free slope).  \n\n"
+                "In contrast, **Standardised sensitivity** scales the partial derivative "
+                "by the parameter’s own standard deviation, illuminating which sources of "
+                "uncertainty dominate the overall variability.  \n\n"
+                "In practice, high elasticity indicates a *lever* for managerial control, "
+                "whereas high standardised sensitivity signals a *risk* that should be "
+                "mitigated (e.g., via additional data collection or process stabilisation)."
+            ),
+        },
+        # ———————————————————————————————————————————————
+        "standardized_sensitivity": {
+            "title": "Standardised Sensitivity",
+            "xaxis": "Standardised Sensitivity  (ΔE / σ_E)",
+            "expander_title": "📘 Standardised Sensitivity (σ-normalised)",
+            "expander_content": (
+                "Computed as (∂E/∂x) · σₓ / σ_E, this metric places all parameters on a "
+                "common variance-normalised footing. A value of 1 implies that a "
+                "one-standard-deviation shock in the parameter shifts E_total by one "
+                "standard deviation, ceteris paribus."
+            ),
+        },
+        # ———————————————————————————————————————————————
+        "monte_carlo": {
+            "title": "Monte-Carlo Summary",
+            "expander_title": "📘 Monte-Carlo Input Distributions",
+            "expander_content": (
+                "Each uncertain parameter is stochastically sampled around the *current UI "
+                "value* to emulate real-world process variability.  \n\n"
+                "• **a₁, a₂**   Normal (μ = UI, σ = 3 % μ)  \n"
+                "• **a₃**       Triangular (lower = 0.9 μ, mode = μ, upper = 1.1 μ)  \n"
+                "• **b₀**       Uniform [max(0, μ−0.10), min(1, μ+0.10)]  \n"
+                "• **CR, PP**   Triangular [0.8 μ, μ, 1.2 μ]  \n"
+                "• **ℓ**        Triangular [0.8 μ, μ, 1.2 μ]  \n"
+                "• **T₁–T₃**    Normal (μ = UI, σ = 10 % μ)  \n\n"
+                "_If the UI value of CR, PP, or ℓ is **zero**, the parameter is kept at "
+                "zero (i.e., no stochastic variation is introduced)._  \n\n"
+                "The resulting histogram overlays the mean (solid line), median (solid line), "
+                "and 5–95 % credible interval (dotted lines) to provide an at-a-glance view "
+                "of central tendency and dispersion."
+            ),
+            "variable": "MC variable",
+            "mean": "Mean",
+            "median": "Median",
+            "ci": "5–95 % CI",
+            "caption": {
+                "en": "Histogram with mean (solid), median (solid), 5–95 % CI (dotted)",
+                "ja": "ヒストグラム：平均/中央値＝実線、信頼区間＝点線"
+            },
+            "card_unit": "[E_total]",
+        },
+    },
+}
+TXT_JA = {
+    "panel": {
+        "input": "入力パネル",
+        "output": "主要出力指標",
+    },
+    "metrics": {
+        "a_total": "a_total",
+        "succ": "成功率 S",
+        "C": "C（作業工数）",
+        "Closs": "C_total（損失込）",
+        "loss_unit": "損失単価 ℓ",
+        "E_base": "効率 E（ベースライン）",
+        "E_total": "E_total",
+    },
+    "charts": {
+        # ———————————————————————————————————————————————
+        "quality_schedule": {
+            "title": "品質 × 納期 2 × 2 マトリクス",
+            "expander_title": "📘 チャートの読み方",
+            "expander_content": (
+                "横軸に品質（標準／低）、縦軸に納期（オンタイム／遅延）の "
+                "2 × 2 組み合わせを配置し、各バーの高さで **E_total** "
+                "（成功 1 件あたり総コスト）を示します。バー上のラベルは "
+                "対応する成功率 **S** を百分率で表示します。  \n\n"
+                "👉 4 通りのシナリオを一目で比較し、品質施策と納期施策の "
+                "どちらが経済的に優位かを判断してください。"
+            ),
+        },
+        # ———————————————————————————————————————————————
+        "tornado": {
+            "title": "ローカル トルネード感度 (±20 %)",
+            "expander_title": "📘 トルネード図とは",
+            "expander_content": (
+                "各入力パラメータを **UI 値から ±20 %** だけ単独で変動させ、"
+                "そのときのコスト効率 **E_total** の相対変化 |ΔE/E| をバーの長さ "
+                "として描画します。  \n\n"
+                "バーが長い＝そのパラメータが **局所的** に最も強い影響を持つ "
+                "ことを意味し、改善・調整の優先度を示唆します。"
+            ),
+            "xaxis": "|ΔE/E|",
+        },
+        # ———————————————————————————————————————————————
+        "sobol": {
+            "title": "グローバル感度 (Sobol S₁)",
+            "expander_title": "📘 Sobol 感度解析の概要",
+            "expander_content": (
+                "Saltelli 拡張を用いた Sobol 法で、各パラメータを UI 基準値 ±α % "
+                "の範囲で同時にサンプリングし、**E_total** の分散に対する一次寄与 "
+                "（Sobol 指数 **S₁**）を算出します。  \n\n"
+                "S₁ が大きいほど、そのパラメータ単独で結果の不確実性を左右している "
+                "度合いが高いと解釈できます。"
+            ),
+            "xaxis": "Sobol S₁",
+        },
+        # ———————————————————————————————————————————————
+        "relative_sensitivity": {
+            "title": "相対弾性値",
+            "xaxis": "相対感度 (∂E/∂x·x/E)",
+            "expander_title": "📘 指標の意味と活用",
+            "expander_content": (
+                "相対弾性値（Elasticity）はパラメータを 1 % 変化させた際に "
+                "**E_total** が何パーセント変動するかを示す次元レス量です。  \n\n"
+                "値が大きいほど “てこの原理” が効きやすく、コスト効率改善の "
+                "レバーとして有効であることを示唆します。"
+            ),
+        },
+        # ———————————————————————————————————————————————
+        "standardized_sensitivity": {
+            "title": "標準化感度",
+            "xaxis": "標準化感度 (ΔE/σ_E)",
+            "expander_title": "📘 標準化感度とは",
+            "expander_content": (
+                "パラメータの標準偏差 σₓ で正規化した感度 "
+                "(∂E/∂x)·σₓ/σ_E を示します。  \n\n"
+                "大きい値は『そのパラメータの不確実性が **E_total** の変動に "
+                "大きく寄与している』ことを示し、リスク管理やデータ収集の "
+                "優先度付けに役立ちます。"
+            ),
+        },
+        # ———————————————————————————————————————————————
+        "monte_carlo": {
+            "title": "モンテカルロ要約",
+            "expander_title": "📘 入力分布の設定 (UI 基準)",
+            "expander_content": (
+                "各パラメータは **現在の UI 値** を中心に以下の分布でサンプリング "
+                "されます：  \n\n"
+                "• **a₁, a₂**  正規分布 (μ = UI, σ = 3 % μ)  \n"
+                "• **a₃**      三角分布 (下限 = 0.9 μ, モード = μ, 上限 = 1.1 μ)  \n"
+                "• **b₀**      一様分布 [max(0, μ−0.10), min(1, μ+0.10)]  \n"
+                "• **CR, PP**  三角分布 [0.8 μ, μ, 1.2 μ]  \n"
+                "• **ℓ**       三角分布 [0.8 μ, μ, 1.2 μ]  \n"
+                "• **T₁–T₃**   正規分布 (μ = UI, σ = 10 % μ)  \n\n"
+                "※ **CR・PP・ℓ の UI 値が 0** の場合、そのパラメータは 0 に固定され "
+                "変動を与えません。  \n\n"
+                "ヒストグラムには平均（実線）、中央値（実線）、信頼区間 5–95 % "
+                "（点線）が重ね描きされ、中心傾向とばらつきが一目で把握できます。"
+            ),
+            "variable": "MC対象変数",
+            "mean": "平均",
+            "median": "中央値",
+            "ci": "5–95 % CI",
+            "caption": {
+                "en": "Histogram with mean (solid), median (solid), 5–95 % CI (dotted)",
+                "ja": "ヒストグラム：平均/中央値＝実線、信頼区間＝点線"
+            },
+            "card_unit": "[E_total]",
+        },
+    },
+}
+# ░░░░░░░░░░░░░ ねこ語 UI パック ░░░░░░░░░░░░░
+# ＊英語(JA)と同じキー構造なので drop-in 置換できるにゃ＊
+
+TXT_CAT = {
+    "panel": {
+        "input": "にゅうりょく ぱねる にゃ",
+        "output": "たいせつ けっか にゃ",
+    },
+
+    # ────────────────────────
+    "metrics": {
+        "a_total": "a_total にゃ",
+        "succ": "せいこうりつ S にゃ",
+        "C": "おしごとコスト C にゃ",
+        "Closs": "C_total (そんしつこみ) にゃ",
+        "loss_unit": "そんしつたんか ℓ にゃ",
+        "E_base": "こうりつ E (べーす) にゃ",
+        "E_total": "E_total にゃ",
+    },
+
+    # ────────────────────────
+    "charts": {
+        # 1) 品質×納期
+        "quality_schedule": {
+            "title": "ひんしつ × のうき 2×2 にゃ",
+            "expander_title": "📘 これなあに？ にゃ",
+            "expander_content": (
+                "４つのバーで **E_total** のたかさをくらべるにゃ。"
+                "バーのうえの数字は **S** (せいこう％) にゃ。\n\n"
+                "ねこポイント：よこ列・たて列で『どっちがトク？』を見つけるにゃ〜🐾"
+            ),
+        },
+
+        # 2) トルネード
+        "tornado": {
+            "title": "とるねーど がんど (±20%) にゃ",
+            "expander_title": "📘 ぐるぐる棒のひみつ にゃ",
+            "expander_content": (
+                "パラメータを１こずつ ±20% うごかして "
+                "**|ΔE/E|** (E_total のへんか) を棒のながさで見せるにゃ。\n\n"
+                "なが〜い棒 → 『ここ なおすと いちばん きく！』 にゃ🐱"
+            ),
+            "xaxis": "|ΔE/E| にゃ",
+        },
+
+        # 3) ソーボル
+        "sobol": {
+            "title": "そーぼる S₁ にゃ",
+            "expander_title": "📘 そーぼる？ おいしい？ にゃ",
+            "expander_content": (
+                "ぜんぶのパラメータを いっせいに ユサユサして "
+                "ぶれのわりあい **S₁** をはかるにゃ。\n\n"
+                "S₁ が 1 にちかい → その子だけで 大あばれ にゃ！"
+            ),
+            "xaxis": "S₁ にゃ",
+        },
+
+        # 4) 相対弾性度
+        "relative_sensitivity": {
+            "title": "そうたい びよ〜ん にゃ",
+            "xaxis": "Elasticity (=∂E/∂x·x/E) にゃ",
+            "expander_title": "📘 びよ〜ん とは？ にゃ",
+            "expander_content": (
+                "1% うごかすと **E_total** が 何% うごくかを見るにゃ。\n"
+                "大きい値 → 『せっけい がんばる と いいにゃ！』"
+            ),
+        },
+
+        # 5) 標準化感度
+        "standardized_sensitivity": {
+            "title": "ひょうじゅんか かんど にゃ",
+            "xaxis": "StdSens (=∂E/∂x·σₓ/σ_E) にゃ",
+            "expander_title": "📘 リスクに注意にゃ",
+            "expander_content": (
+                "パラメータの ふらつき (σ) をかけて\n"
+                "**E_total** が どれだけ ゆれるかをチェックにゃ。\n"
+                "大きい値 → 『運用ちゅう リスク注意！』"
+            ),
+        },
+
+        # 6) モンテカルロ
+        "monte_carlo": {
+            "title": "もんて かるろ にゃ〜",
+            "expander_title": "📘 サンプリングのおやつ にゃ",
+            "expander_content": (
+                "ぜんぶ UI の今の値を まんなかに ふらふらサンプルにゃ。\n\n"
+                "・a₁,a₂ → 正規(±3%) にゃ\n"
+                "・a₃ → 三角(0.9〜1.1) にゃ\n"
+                "・b₀ → 一様(±0.10) にゃ\n"
+                "・CR,PP,ℓ → 三角(0.8〜1.2) にゃ (ぜろなら固定にゃ)\n"
+                "・T₁–T₃ → 正規(±10%) にゃ\n\n"
+                "ヒストグラムに平均・中央値(実線)と 5–95% (点線) をペタッとにゃ。"
+            ),
+            "variable": "みる子 にゃ",
+            "mean": "へいきん にゃ",
+            "median": "ちゅうおう にゃ",
+            "ci": "5–95% にゃ",
+            "caption": {
+                "en": "Mean & Median = solid, CI = dotted にゃ",
+                "ja": "平均/中央値=実線, 信頼区間=点線 にゃ"
+            },
+            "card_unit": "[E_total] にゃ",
+        },
+    },
+}
+
+# ------ register all packs (order: EN is default) ------
+TXT_ALL = {"EN": TXT_EN, "JA": TXT_JA, "CAT": TXT_CAT}   # ← ここで初めてまとめる